@@ -1,18 +1,74 @@
-from flask import Flask, request, jsonify, send_from_directory, render_template, abort, redirect
-from pymongo import MongoClient, ASCENDING
-from pymongo.errors import DuplicateKeyError, OperationFailure
+from flask import Flask, request, jsonify, send_from_directory, render_template, abort, redirect, Response, stream_with_context, url_for
+from flask.json.provider import JSONProvider
+from pymongo import MongoClient, ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError, OperationFailure, PyMongoError
 from dotenv import load_dotenv
 from flask_cors import CORS
-from datetime import datetime, UTC
-from pydantic import BaseModel, EmailStr, ValidationError, Field
-from typing import Dict, Any, List, Optional
+from datetime import datetime, date, UTC
+from pydantic import BaseModel, ValidationError
+from typing import Dict, Any, List, Optional, Type
 import os
 import logging
 import json
+import decimal
+import mimetypes
+import uuid
+import math
+import threading
+import queue
+import time
+from collections import OrderedDict
+from functools import wraps
 from dateutil import parser
+from models import PatientCreate, PatientUpdate, NoteCreate, PatientBatchGet, AuditLog
 import cohere
 from http import HTTPStatus
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib encoder
+    orjson = None
+
+# JSON serialization helpers shared by the Flask provider and the log formatter
+def _json_default(obj):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+def json_dumps(obj: Any) -> str:
+    return json_dumps_bytes(obj).decode("utf-8")
+
+class FastJSONProvider(JSONProvider):
+    """JSON provider backed by orjson when installed, stdlib json otherwise.
+
+    Datetimes are emitted as ISO 8601 strings by both backends, so callers can
+    hand ``datetime`` values straight to ``jsonify``.
+    """
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return json_dumps(obj)
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(json_dumps_bytes(obj), mimetype=self.mimetype)
+
 # Configure structured logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,14 +77,14 @@ logging.getLogger('pymongo').setLevel(logging.WARNING)
 class JsonFormatter(logging.Formatter):
     def format(self, record):
         log_record = {
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp": datetime.now(UTC),
             "level": record.levelname,
             "message": record.getMessage(),
             "module": record.module,
             "function": record.funcName,
             "line": record.lineno
         }
-        return json.dumps(log_record)
+        return json_dumps(log_record)
 
 handler = logging.StreamHandler()
 handler.setFormatter(JsonFormatter())
@@ -50,57 +106,58 @@ class ValidationErrorCustom(Exception):
         self.status_code = status_code
         super().__init__(self.message)
 
-# Pydantic models for validation
-class ContactInfo(BaseModel):
-    phone: str = Field(..., min_length=10, max_length=15)
-    email: EmailStr
-    address: str = Field(..., min_length=1)
-
-class PatientCreate(BaseModel):
-    name: str = Field(..., min_length=1, max_length=100)
-    age: int = Field(..., ge=0, le=150)
-    gender: Optional[str] = Field(default=None, max_length=20)
-    contact_info: ContactInfo
-    allergies: List[str] = []
-    blood_group: Optional[str] = Field(default=None, max_length=10)
-    emergency_contact_number: str = Field(..., min_length=10, max_length=15)
-    prescriptions: List[str] = []
-    doctor_notes: List[str] = []
-    department: Optional[str] = Field(default=None, min_length=1, max_length=100)
-    user_id: str = "anonymous"
-
-class PatientUpdate(BaseModel):
-    name: Optional[str] = Field(default=None, min_length=1, max_length=100)
-    age: Optional[int] = Field(default=None, ge=0, le=150)
-    gender: Optional[str] = Field(default=None, max_length=20)
-    contact_info: Optional[ContactInfo] = None
-    allergies: Optional[List[str]] = None
-    blood_group: Optional[str] = Field(default=None, max_length=10)
-    emergency_contact_number: Optional[str] = Field(default=None, min_length=10, max_length=15)
-    prescriptions: Optional[List[str]] = None
-    doctor_notes: Optional[List[str]] = None
-    department: Optional[str] = Field(default=None, min_length=1, max_length=100)
-    user_id: str = "anonymous"
-
-class AuditLog(BaseModel):
-    action: str
-    patient_id: Optional[int] = None
-    user_id: str
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
-    details: Dict[str, Any] = {}
+# Request validation: models validate the raw body bytes directly, skipping json.loads
+def parse_request_body(model: Type[BaseModel]):
+    raw = request.get_data(cache=True)
+    if not raw or not raw.strip():
+        raise ValidationErrorCustom("No data provided")
+    return model.model_validate_json(raw)
 
 # Initialize Flask app
 app = Flask(__name__,
             template_folder='templates',
             static_folder='static')
-CORS(app)
-
-# Custom rule for serving JavaScript files from the 'js' directory
-app.add_url_rule(
-    '/js/<path:filename>',
-    endpoint='js_static',
-    view_func=lambda filename: send_from_directory('js', filename)
-)
+app.json = FastJSONProvider(app)
+CORS(app, origins=os.getenv("CORS_ORIGINS", "*").split(","), expose_headers=["Retry-After"])
+
+# Fingerprinted assets built by assets.py; templates fall back to /static when absent
+ASSET_DIST_DIR = os.path.join(app.static_folder, 'dist')
+ASSET_MAX_AGE = 31536000
+
+def load_asset_manifest() -> Dict[str, str]:
+    manifest_path = os.path.join(ASSET_DIST_DIR, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    logger.info({"message": f"Serving {len(manifest)} fingerprinted assets"})
+    return manifest
+
+asset_manifest = load_asset_manifest()
+
+@app.template_global()
+def asset_url(filename: str) -> str:
+    built = asset_manifest.get(filename)
+    if built:
+        return url_for('serve_asset', filename=built)
+    return url_for('static', filename=filename)
+
+@app.route('/assets/<path:filename>')
+def serve_asset(filename):
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = None
+    for name, suffix in (('br', '.br'), ('gzip', '.gz')):
+        # Quality lookup honours q=0 and wildcards in Accept-Encoding
+        if request.accept_encodings[name] > 0 and os.path.exists(os.path.join(ASSET_DIST_DIR, filename + suffix)):
+            encoding, filename = name, filename + suffix
+            break
+
+    response = send_from_directory(ASSET_DIST_DIR, filename, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    response.headers['Vary'] = 'Accept-Encoding'
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
 
 # Initialize database and collections
 def initialize_database():
@@ -120,6 +177,10 @@ def initialize_database():
         if "audit_logs" not in db.list_collection_names():
             db.create_collection("audit_logs")
             logger.info({"message": "Created audit_logs collection"})
+
+        if "patient_notes" not in db.list_collection_names():
+            db.create_collection("patient_notes")
+            logger.info({"message": "Created patient_notes collection"})
             
     except Exception as e:
         logger.error({"message": f"Failed to initialize database: {str(e)}"})
@@ -146,10 +207,15 @@ try:
         db.create_collection("audit_logs")
         logger.info({"message": "Created audit_logs collection"})
     
+    if "patient_notes" not in db.list_collection_names():
+        db.create_collection("patient_notes")
+        logger.info({"message": "Created patient_notes collection"})
+    
     # Set references to collections
     patients_collection = db["patients"]
     counters_collection = db["counters"]
     audit_logs_collection = db["audit_logs"]
+    patient_notes_collection = db["patient_notes"]
     
     logger.info({"message": "Connected to MongoDB successfully"})
 except Exception as e:
@@ -189,6 +255,10 @@ def setup_indexes():
         if not any(idx['key'] == [('emergency_contact_number', 1)] for idx in patient_indexes.values()):
             patients_collection.create_index([("emergency_contact_number", ASCENDING)], unique=True, sparse=True)
 
+        # Used by the live-update polling fallback
+        if not any(idx['key'] == [('updated_at', 1)] for idx in patient_indexes.values()):
+            patients_collection.create_index([("updated_at", ASCENDING)])
+
         # Create text index for name
         text_index_name = "patient_text_search"
         desired_weights = {"name": 1}
@@ -222,16 +292,30 @@ def setup_indexes():
         if not any(idx['key'] == [('timestamp', 1)] for idx in audit_indexes.values()):
             audit_logs_collection.create_index([("timestamp", ASCENDING)], name="timestamp_idx")
 
+        # Handle patient notes index (newest first per patient)
+        notes_indexes = patient_notes_collection.index_information()
+        if "patient_created_idx" not in notes_indexes:
+            patient_notes_collection.create_index(
+                [("patient_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="patient_created_idx"
+            )
+
         logger.info("Database indexes created or verified successfully")
 
     except OperationFailure as e:
         logger.error(f"Failed to create indexes: {str(e)}")
         raise DatabaseError(f"Failed to create indexes: {str(e)}")
 
+# Server-side validation duplicates the Pydantic checks; level is strict, moderate or off
+SCHEMA_VALIDATION_LEVEL = os.getenv("SCHEMA_VALIDATION_LEVEL", "strict").lower()
+if SCHEMA_VALIDATION_LEVEL not in ("strict", "moderate", "off"):
+    raise ValueError(f"Invalid SCHEMA_VALIDATION_LEVEL: {SCHEMA_VALIDATION_LEVEL}")
+
 # Add schema validation for patients collection
 try:
     db.command({
         "collMod": "patients",
+        "validationLevel": SCHEMA_VALIDATION_LEVEL,
         "validator": {
             "$jsonSchema": {
                 "bsonType": "object",
@@ -301,6 +385,10 @@ try:
                             "bsonType": "string"
                         }
                     },
+                    "doctor_notes_count": {
+                        "bsonType": "int",
+                        "minimum": 0
+                    },
                     "department": {
                         "bsonType": ["string", "null"],
                         "minLength": 1,
@@ -319,11 +407,20 @@ try:
             }
         }
     })
-    logger.info({"message": "Schema validation added to patients collection"})
+    logger.info({"message": f"Schema validation added to patients collection (level: {SCHEMA_VALIDATION_LEVEL})"})
 except OperationFailure as e:
     logger.error({"message": f"Failed to add schema validation: {str(e)}"})
     raise DatabaseError(f"Failed to add schema validation: {str(e)}")
 
+# Pre-images let delete events in the change stream carry the patient_id (MongoDB 6.0+).
+# They cost an extra write on every update and delete, so they are opt-in; without them
+# live dashboards resync on deletes. Setting the option either way also undoes an earlier run.
+CHANGE_STREAM_PRE_IMAGES = os.getenv("CHANGE_STREAM_PRE_IMAGES", "false").lower() == "true"
+try:
+    db.command({"collMod": "patients", "changeStreamPreAndPostImages": {"enabled": CHANGE_STREAM_PRE_IMAGES}})
+except OperationFailure as e:
+    logger.info({"message": f"Change stream pre-images not configurable: {str(e)}"})
+
 # Get next sequence value
 def get_next_sequence(name):
     try:
@@ -339,15 +436,219 @@ def get_next_sequence(name):
         logger.error({"message": f"Error getting sequence for {name}: {str(e)}"})
         raise DatabaseError(f"Error getting sequence: {str(e)}")
 
+# Patient fields clients may request in a projection
+PATIENT_FIELDS = {
+    "patient_id", "name", "age", "gender", "contact_info", "contact_info.phone",
+    "contact_info.email", "contact_info.address", "allergies", "blood_group",
+    "emergency_contact_number", "prescriptions", "doctor_notes", "doctor_notes_count",
+    "department", "user_id", "created_at", "updated_at"
+}
+
+# Compact default for list views; enough for the patients table and dashboard cards
+PATIENT_LIST_FIELDS = [
+    "patient_id", "name", "age", "gender", "department", "blood_group",
+    "contact_info.phone", "created_at", "updated_at"
+]
+
+# Parse a comma-separated fields= query parameter; "all" selects the whole document
+def parse_fields_param(value: Optional[str], default: Optional[List[str]] = None) -> Optional[List[str]]:
+    if value is None or not value.strip():
+        return default
+    if value.strip() == "all":
+        return None
+    return [f.strip() for f in value.split(",") if f.strip()]
+
+# Build a MongoDB projection from a list of requested patient fields
+def build_patient_projection(fields: Optional[List[str]]) -> Dict[str, int]:
+    if not fields:
+        return {"_id": 0}
+    unknown = sorted(set(fields) - PATIENT_FIELDS)
+    if unknown:
+        raise ValidationErrorCustom(f"Unknown fields: {', '.join(unknown)}", 400)
+    projection = {"_id": 0, "patient_id": 1}
+    for field in fields:
+        # A parent field already covers its sub-fields; projecting both is a path collision
+        if "." in field and field.split(".", 1)[0] in fields:
+            continue
+        projection[field] = 1
+    return projection
+
+# Number of most recent doctor notes embedded in the patient document
+RECENT_NOTES_LIMIT = 5
+
+# Patient update operators that record appended notes in the embedded summary
+def note_update_ops(notes: List[str]) -> Dict[str, Any]:
+    return {
+        "$push": {"doctor_notes": {"$each": notes, "$slice": -RECENT_NOTES_LIMIT}},
+        "$inc": {"doctor_notes_count": len(notes)}
+    }
+
+# Store notes in patient_notes; call only after the patient write has succeeded
+def insert_patient_notes(patient_id: int, notes: List[str], user_id: str, created_at: str):
+    try:
+        patient_notes_collection.insert_many([
+            {"patient_id": patient_id, "note": note, "user_id": user_id, "created_at": created_at}
+            for note in notes
+        ])
+    except Exception as e:
+        logger.error({"message": f"Failed to store {len(notes)} notes for patient {patient_id}: {str(e)}"})
+        raise DatabaseError("Failed to store doctor notes")
+
+# One-time migration of embedded doctor_notes arrays into patient_notes.
+# Migrated notes get deterministic _ids and are upserted, so a crash or several
+# workers migrating concurrently cannot duplicate a patient's history. Completion is
+# recorded in counters so later starts skip the unindexed scan of patients.
+NOTES_MIGRATION_MARKER = "doctor_notes_migration"
+
+def migrate_doctor_notes():
+    if counters_collection.count_documents({"_id": NOTES_MIGRATION_MARKER}, limit=1):
+        return
+    migrated = 0
+    for patient in patients_collection.find(
+        {"doctor_notes_count": {"$exists": False}},
+        {"_id": 0, "patient_id": 1, "doctor_notes": 1, "user_id": 1, "updated_at": 1, "created_at": 1}
+    ):
+        notes = [n for n in (patient.get("doctor_notes") or []) if n]
+        if notes:
+            created_at = patient.get("updated_at") or patient.get("created_at") or datetime.now(UTC).isoformat()
+            patient_notes_collection.bulk_write([
+                UpdateOne(
+                    {"_id": {"patient_id": patient["patient_id"], "index": index}},
+                    {"$setOnInsert": {"patient_id": patient["patient_id"], "note": note,
+                                      "user_id": patient.get("user_id", "anonymous"), "created_at": created_at}},
+                    upsert=True
+                )
+                for index, note in enumerate(notes)
+            ], ordered=False)
+        patients_collection.update_one(
+            {"patient_id": patient["patient_id"], "doctor_notes_count": {"$exists": False}},
+            {"$set": {"doctor_notes": notes[-RECENT_NOTES_LIMIT:], "doctor_notes_count": len(notes)}}
+        )
+        migrated += 1
+    counters_collection.update_one(
+        {"_id": NOTES_MIGRATION_MARKER},
+        {"$setOnInsert": {"completed_at": datetime.now(UTC).isoformat()}},
+        upsert=True
+    )
+    if migrated:
+        logger.info({"message": f"Migrated doctor notes for {migrated} patients"})
+
+# Token-bucket stores for rate limiting
+class MemoryRateLimitStore:
+    """Per-process token buckets kept in LRU order; suitable for a single worker."""
+    max_buckets = 10000
+
+    def __init__(self):
+        # key -> (tokens, last refill time)
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, rate: float, capacity: int) -> float:
+        """Take one token; return 0 if allowed, else seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * rate)
+            allowed = tokens >= 1
+            self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+            # Evict the least recently used bucket; O(1) per request
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+            return 0.0 if allowed else (1 - tokens) / rate
+
+class MongoRateLimitStore:
+    """Token buckets shared by all workers, updated atomically with a pipeline update."""
+
+    def __init__(self, collection):
+        self._collection = collection
+        if "expires_at_ttl" not in collection.index_information():
+            collection.create_index([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0)
+
+    def consume(self, key: str, rate: float, capacity: int) -> float:
+        now = time.time()
+        refilled = {"$min": [capacity, {"$add": [
+            {"$ifNull": ["$tokens", capacity]},
+            {"$multiply": [{"$subtract": [now, {"$ifNull": ["$ts", now]}]}, rate]}
+        ]}]}
+        bucket = self._collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": refilled, "ts": now}},
+                {"$set": {
+                    "allowed": {"$gte": ["$tokens", 1]},
+                    "tokens": {"$cond": [{"$gte": ["$tokens", 1]}, {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                    "expires_at": datetime.fromtimestamp(now + capacity / rate, UTC)
+                }}
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if bucket["allowed"]:
+            return 0.0
+        return (1 - bucket["tokens"]) / rate
+
+def create_rate_limit_store():
+    backend = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+    if backend == "mongo":
+        return MongoRateLimitStore(db["rate_limits"])
+    if backend != "memory":
+        logger.warning({"message": f"Unknown RATE_LIMIT_BACKEND '{backend}', using memory"})
+    return MemoryRateLimitStore()
+
+rate_limit_store = create_rate_limit_store()
+endpoint_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+# Rate limit and cap concurrency of an expensive endpoint; limits are overridable via env
+def rate_limited(name: str, per_minute: int, burst: int, max_concurrent: int):
+    env_name = name.upper()
+    per_minute = int(os.getenv(f"{env_name}_RATE_PER_MINUTE", per_minute))
+    burst = int(os.getenv(f"{env_name}_RATE_BURST", burst))
+    max_concurrent = int(os.getenv(f"{env_name}_MAX_CONCURRENT", max_concurrent))
+    rate = per_minute / 60.0
+    semaphore = endpoint_semaphores.setdefault(name, threading.BoundedSemaphore(max_concurrent))
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # user_id is unauthenticated, so the per-IP bucket is always enforced;
+            # a named user additionally gets a bucket shared across their IPs
+            client_ip = request.remote_addr or 'unknown'
+            user_id = request.args.get('user_id', 'anonymous')
+            keys = [f"{name}:ip:{client_ip}"]
+            if user_id != 'anonymous':
+                keys.append(f"{name}:user:{user_id}")
+            try:
+                retry_after = 0.0
+                for key in keys:
+                    retry_after = rate_limit_store.consume(key, rate, burst)
+                    if retry_after > 0:
+                        break
+            except Exception as e:
+                # Fail open: a broken limiter backend must not take the endpoint down
+                logger.error({"message": f"Rate limiter error: {str(e)}"})
+                retry_after = 0.0
+            if retry_after > 0:
+                return jsonify({"message": "Too many requests"}), 429, {"Retry-After": str(math.ceil(retry_after))}
+            if not semaphore.acquire(blocking=False):
+                return jsonify({"message": "Server busy, please retry"}), 503, {"Retry-After": "1"}
+            try:
+                return view(*args, **kwargs)
+            finally:
+                semaphore.release()
+        return wrapper
+    return decorator
+
 # Log audit actions
 def log_audit_action(action: str, patient_id: Optional[int], user_id: str, details: Dict[str, Any]):
     try:
-        audit_log = AuditLog(
-            action=action,
-            patient_id=patient_id,
-            user_id=user_id,
-            details=details
-        ).model_dump()
+        # Built directly rather than through AuditLog; arguments come from trusted server code
+        audit_log = {
+            "action": action,
+            "patient_id": patient_id,
+            "user_id": user_id,
+            "timestamp": datetime.now(UTC),
+            "details": details
+        }
         audit_logs_collection.insert_one(audit_log)
         logger.info({"message": f"Audit log created: {action}", "patient_id": patient_id, "user_id": user_id})
     except Exception as e:
@@ -356,6 +657,7 @@ def log_audit_action(action: str, patient_id: Optional[int], user_id: str, detai
 # Initialize database
 initialize_counters()
 setup_indexes()
+migrate_doctor_notes()
 
 # Routes for serving HTML pages
 @app.route('/')
@@ -391,6 +693,8 @@ def get_patients():
         name = request.args.get('name', '').strip()
         sort = request.args.get('sort', 'name').strip()
         department = request.args.get('department', '').strip()
+        fields = parse_fields_param(request.args.get('fields'), PATIENT_LIST_FIELDS)
+        projection = build_patient_projection(fields)
 
         skip = (page - 1) * limit
         query = {}
@@ -412,7 +716,7 @@ def get_patients():
         try:
             patients = list(patients_collection.find(
                 query,
-                {"_id": 0}
+                projection
             ).sort(sort_field, sort_order).skip(skip).limit(limit))
         except OperationFailure as e:
             logger.error({"message": f"MongoDB query failed: {str(e)}"})
@@ -438,6 +742,8 @@ def get_patients():
 
     except ValueError as e:
         return jsonify({"message": str(e)}), 400
+    except ValidationErrorCustom as e:
+        return jsonify({"message": str(e)}), e.status_code
     except Exception as e:
         logger.error({"message": f"Error fetching patients: {str(e)}"})
         return jsonify({"message": "Internal server error"}), 500
@@ -445,11 +751,7 @@ def get_patients():
 @app.route('/patients', methods=['POST'])
 def add_patient():
     try:
-        data = request.get_json()
-        if not data:
-            raise ValidationErrorCustom("No data provided")
-
-        patient_data = PatientCreate(**data).model_dump(exclude_none=True)
+        patient_data = parse_request_body(PatientCreate).model_dump(exclude_none=True)
         
         if len(patient_data.get("prescriptions", [])) > 20:
             raise ValidationErrorCustom("Maximum of 20 prescriptions", 400)
@@ -459,9 +761,15 @@ def add_patient():
         patient_data["created_at"] = datetime.now(UTC).isoformat()
         patient_data["updated_at"] = patient_data["created_at"]
 
+        notes = [n for n in patient_data.get("doctor_notes", []) if n]
+        patient_data["doctor_notes"] = notes[-RECENT_NOTES_LIMIT:]
+        patient_data["doctor_notes_count"] = len(notes)
+
         result = patients_collection.insert_one(patient_data)
         if not result.inserted_id:
             raise DatabaseError("Failed to insert patient")
+        if notes:
+            insert_patient_notes(patient_id, notes, patient_data["user_id"], patient_data["created_at"])
 
         log_audit_action("add_patient", patient_id, patient_data["user_id"], {
             "name": patient_data["name"],
@@ -486,19 +794,283 @@ def add_patient():
         logger.error({"message": f"Error adding patient: {str(e)}"})
         return jsonify({"message": "Internal server error"}), 500
 
+@app.route('/patients/batch_get', methods=['POST'])
+def batch_get_patients():
+    try:
+        user_id = request.args.get('user_id', 'anonymous')
+        batch = parse_request_body(PatientBatchGet)
+        patient_ids = list(dict.fromkeys(batch.ids))
+        projection = build_patient_projection(batch.fields)
+
+        found = {
+            p["patient_id"]: p
+            for p in patients_collection.find({"patient_id": {"$in": patient_ids}}, projection)
+        }
+        patients = [found[pid] for pid in patient_ids if pid in found]
+        missing_ids = [pid for pid in patient_ids if pid not in found]
+
+        log_audit_action("batch_get_patients", None, user_id, {
+            "patient_ids": [p["patient_id"] for p in patients],
+            "missing_ids": missing_ids,
+            "fields": batch.fields
+        })
+
+        return jsonify({
+            "patients": patients,
+            "missing_ids": missing_ids
+        }), 200
+
+    except ValidationError as e:
+        return jsonify({"message": e.errors()}), 400
+    except ValidationErrorCustom as e:
+        return jsonify({"message": str(e)}), e.status_code
+    except Exception as e:
+        logger.error({"message": f"Error fetching patient batch: {str(e)}"})
+        return jsonify({"message": "Internal server error"}), 500
+
+# Fields pushed to live dashboards in change events
+STREAM_FIELDS = PATIENT_LIST_FIELDS + ["doctor_notes", "doctor_notes_count"]
+STREAM_HEARTBEAT_SECONDS = 15
+STREAM_POLL_SECONDS = float(os.getenv("PATIENT_STREAM_POLL_SECONDS", 5))
+
+# Reduce a patient document to the given (possibly dotted) fields
+def compact_patient(doc: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    compact = {}
+    for field in fields:
+        parent, _, child = field.partition(".")
+        if parent not in doc:
+            continue
+        if child:
+            if isinstance(doc[parent], dict) and child in doc[parent]:
+                compact.setdefault(parent, {})[child] = doc[parent][child]
+        else:
+            compact[parent] = doc[parent]
+    return compact
+
+def format_sse(event: str, data: Dict[str, Any], event_id: Optional[str] = None) -> str:
+    message = f"event: {event}\n"
+    if event_id:
+        message += f"id: {event_id}\n"
+    return message + f"data: {json_dumps(data)}\n\n"
+
+# Translate a change stream event into a compact delta, or None if the client must resync
+def change_to_delta(change: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    op = change["operationType"]
+    if op == "delete":
+        before = change.get("fullDocumentBeforeChange")
+        if not before:
+            return None
+        return {"op": "delete", "patient_id": before["patient_id"]}
+    doc = change.get("fullDocument")
+    if not doc:
+        return None
+    if op == "update":
+        changed = {f.split(".", 1)[0] for f in change["updateDescription"]["updatedFields"]}
+        fields = [f for f in STREAM_FIELDS if f.split(".", 1)[0] in changed]
+        return {"op": "update", "patient_id": doc["patient_id"], "patient": compact_patient(doc, fields)}
+    return {"op": "insert" if op == "insert" else "update", "patient_id": doc["patient_id"],
+            "patient": compact_patient(doc, STREAM_FIELDS)}
+
+# Error code returned when change streams are used on a standalone mongod
+CHANGE_STREAM_UNSUPPORTED_CODE = 40573
+# InvalidResumeToken, ChangeStreamFatalError, ChangeStreamHistoryLost: the token cannot be resumed
+RESUME_TOKEN_ERROR_CODES = {260, 280, 286}
+# Unknown field: servers before 6.0 reject fullDocumentBeforeChange
+UNKNOWN_FIELD_CODE = 40415
+RESYNC_MESSAGE = format_sse("resync", {})
+
+class PatientChangeHub:
+    """One change stream (or poller) per process, fanned out to SSE subscriber queues.
+
+    The watcher thread starts with the first subscriber and stops once the last
+    one leaves, so idle processes put no load on the database.
+    """
+    queue_size = 100
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._resume_token: Optional[str] = None
+        self._pre_images = CHANGE_STREAM_PRE_IMAGES
+        self.last_event_id: Optional[str] = None
+
+    def subscribe(self) -> "queue.Queue[str]":
+        subscription = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="patient-change-hub", daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _should_stop(self) -> bool:
+        with self._lock:
+            if self._subscribers:
+                return False
+            # The next watcher opens from "now": pages that subscribe later have just
+            # loaded fresh data, so replaying the idle period would apply it twice
+            self._thread = None
+            self._resume_token = None
+            self.last_event_id = None
+            return True
+
+    def _publish(self, message: str, event_id: Optional[str] = None):
+        if event_id:
+            self.last_event_id = event_id
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.put_nowait(message)
+            except queue.Full:
+                # Slow consumer: drop its backlog and have it refetch instead
+                while not subscription.empty():
+                    try:
+                        subscription.get_nowait()
+                    except queue.Empty:
+                        break
+                subscription.put_nowait(RESYNC_MESSAGE)
+
+    def _run(self):
+        while True:
+            try:
+                if self._watch():
+                    return
+                # The stream was invalidated (collection dropped or renamed); reopen it from now
+                logger.warning({"message": "Change stream invalidated, reopening"})
+                self._resume_token = None
+                self._publish(RESYNC_MESSAGE)
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAM_UNSUPPORTED_CODE:
+                    logger.info({"message": f"Change stream unavailable, polling instead: {str(e)}"})
+                    self._poll()
+                    return
+                if e.code == UNKNOWN_FIELD_CODE and self._pre_images:
+                    logger.info({"message": "Change stream pre-images unsupported; deletes will trigger a resync"})
+                    self._pre_images = False
+                    continue
+                if e.code in RESUME_TOKEN_ERROR_CODES:
+                    # Events since the token are gone; subscribers refetch and the stream restarts from now
+                    logger.warning({"message": f"Change stream cannot resume, reopening from now: {str(e)}"})
+                    self._resume_token = None
+                else:
+                    logger.warning({"message": f"Change stream interrupted, resuming: {str(e)}"})
+                # Only a lost history needs a refetch; a resumed stream replays missed events
+                if self._resume_token is None:
+                    self._publish(RESYNC_MESSAGE)
+            except PyMongoError as e:
+                logger.warning({"message": f"Change stream error, resuming: {str(e)}"})
+            if self._should_stop():
+                return
+            time.sleep(1)
+
+    def _watch(self) -> bool:
+        """Relay events until the last subscriber leaves (True) or the stream dies (False)."""
+        pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}]
+        with patients_collection.watch(
+            pipeline,
+            full_document="updateLookup",
+            full_document_before_change="whenAvailable" if self._pre_images else None,
+            resume_after={"_data": self._resume_token} if self._resume_token else None,
+            max_await_time_ms=5000
+        ) as stream:
+            while stream.alive:
+                change = stream.try_next()
+                if change is None:
+                    if self._should_stop():
+                        return True
+                    continue
+                self._resume_token = change["_id"]["_data"]
+                delta = change_to_delta(change)
+                if delta is None:
+                    self._publish(RESYNC_MESSAGE)
+                else:
+                    self._publish(format_sse("patient", delta, self._resume_token), self._resume_token)
+        return False
+
+    # Fallback for standalone mongod: poll the updated_at index and detect deletes by count
+    def _poll(self):
+        last_seen = datetime.now(UTC).isoformat()
+        last_count = patients_collection.estimated_document_count()
+        projection = build_patient_projection(STREAM_FIELDS)
+        while not self._should_stop():
+            time.sleep(STREAM_POLL_SECONDS)
+            try:
+                inserted = 0
+                for doc in patients_collection.find({"updated_at": {"$gt": last_seen}}, projection).sort("updated_at", ASCENDING).limit(100):
+                    op = "insert" if doc.get("created_at") == doc["updated_at"] else "update"
+                    if op == "insert":
+                        inserted += 1
+                    last_seen = doc["updated_at"]
+                    delta = {"op": op, "patient_id": doc["patient_id"], "patient": doc}
+                    self._publish(format_sse("patient", delta, last_seen), last_seen)
+                count = patients_collection.estimated_document_count()
+                if count != last_count + inserted:
+                    self._publish(RESYNC_MESSAGE)
+                last_count = count
+            except PyMongoError as e:
+                logger.warning({"message": f"Patient polling failed: {str(e)}"})
+
+patient_change_hub = PatientChangeHub()
+# Each open stream holds a worker thread, so the number of streams is capped
+patient_stream_slots = threading.BoundedSemaphore(int(os.getenv("MAX_PATIENT_STREAMS", 50)))
+
+@app.route('/patients/stream', methods=['GET'])
+def stream_patients():
+    user_id = request.args.get('user_id', 'anonymous')
+    if not patient_stream_slots.acquire(blocking=False):
+        return jsonify({"message": "Too many live update streams, please retry"}), 503, {"Retry-After": "30"}
+
+    last_event_id = request.headers.get('Last-Event-ID')
+    subscription = patient_change_hub.subscribe()
+    closed = threading.Event()
+
+    def close():
+        if not closed.is_set():
+            closed.set()
+            patient_change_hub.unsubscribe(subscription)
+            patient_stream_slots.release()
+
+    def events():
+        yield "retry: 5000\n\n"
+        # Last-Event-ID is only compared, never used as a resume token, so a stale or
+        # garbage value costs one refetch instead of breaking the shared stream
+        if last_event_id and last_event_id != patient_change_hub.last_event_id:
+            yield RESYNC_MESSAGE
+        while True:
+            try:
+                yield subscription.get(timeout=STREAM_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+
+    log_audit_action("subscribe_patient_stream", None, user_id, {})
+    response = Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+    response.call_on_close(close)
+    return response
+
 @app.route('/patients/<int:patient_id>', methods=['GET'])
 def get_patient(patient_id):
     try:
         user_id = request.args.get('user_id', 'anonymous')
+        fields = parse_fields_param(request.args.get('fields'))
         patient = patients_collection.find_one(
             {"patient_id": patient_id},
-            {"_id": 0}
+            build_patient_projection(fields)
         )
         if not patient:
             raise ValidationErrorCustom("Patient not found", 404)
 
         log_audit_action("get_patient", patient_id, user_id, {
-            "name": patient["name"],
+            "name": patient.get("name"),
             "department": patient.get("department")
         })
 
@@ -514,37 +1086,54 @@ def get_patient(patient_id):
 def update_patient(patient_id):
     try:
         user_id = request.args.get('user_id', 'anonymous')
-        data = request.get_json()
-        if not data:
+        update = parse_request_body(PatientUpdate)
+        if not update.model_fields_set:
             raise ValidationErrorCustom("No data provided")
 
         patient = patients_collection.find_one({"patient_id": patient_id})
         if not patient:
             raise ValidationErrorCustom("Patient not found", 404)
 
-        update_data = PatientUpdate(**data).model_dump(exclude_none=True, exclude_unset=True)
+        update_data = update.model_dump(exclude_none=True, exclude_unset=True)
         update_ops = {"$set": {}}
         for field, value in update_data.items():
-            if field != "user_id":
+            if field not in ("user_id", "doctor_notes"):
                 update_ops["$set"][field] = value
 
         if "prescriptions" in update_data and len(update_data["prescriptions"]) > 20:
             raise ValidationErrorCustom("Maximum of 20 prescriptions", 400)
 
-        if not update_ops["$set"]:
+        # Notes are append-only: doctor_notes must echo the current recent notes,
+        # and anything after that echo is appended to the history
+        now = datetime.now(UTC).isoformat()
+        new_notes = []
+        if "doctor_notes" in update_data:
+            recent_notes = patient.get("doctor_notes") or []
+            submitted_notes = [n for n in update_data["doctor_notes"] if n]
+            if submitted_notes[:len(recent_notes)] != recent_notes:
+                raise ValidationErrorCustom(
+                    "doctor_notes can only append to the current notes; "
+                    f"use POST /patients/{patient_id}/notes to add notes", 400)
+            new_notes = submitted_notes[len(recent_notes):]
+        if new_notes:
+            update_ops.update(note_update_ops(new_notes))
+
+        if not update_ops["$set"] and not new_notes:
             return jsonify({"message": "No updates provided"}), 200
 
-        update_ops["$set"]["updated_at"] = datetime.now(UTC).isoformat()
+        update_ops["$set"]["updated_at"] = now
         result = patients_collection.update_one(
             {"patient_id": patient_id},
             update_ops
         )
         if result.modified_count == 0:
             raise DatabaseError("Failed to update patient")
+        if new_notes:
+            insert_patient_notes(patient_id, new_notes, user_id, now)
 
         log_audit_action("update_patient", patient_id, user_id, {
             "name": update_data.get("name", patient["name"]),
-            "updated_fields": list(update_ops["$set"].keys()),
+            "updated_fields": list(update_ops["$set"].keys()) + (["doctor_notes"] if new_notes else []),
             "department": update_data.get("department", patient.get("department"))
         })
 
@@ -559,6 +1148,87 @@ def update_patient(patient_id):
         logger.error(f"Error updating patient: {str(e)}")
         return jsonify({"message": "Internal server error"}), 500
 
+@app.route('/patients/<int:patient_id>/notes', methods=['GET'])
+def get_patient_notes(patient_id):
+    try:
+        user_id = request.args.get('user_id', 'anonymous')
+        page = max(1, int(request.args.get('page', 1)))
+        limit = max(1, min(int(request.args.get('limit', 20)), 100))
+        skip = (page - 1) * limit
+
+        patient = patients_collection.find_one(
+            {"patient_id": patient_id},
+            {"_id": 0, "name": 1, "doctor_notes_count": 1}
+        )
+        if not patient:
+            raise ValidationErrorCustom("Patient not found", 404)
+
+        notes = list(patient_notes_collection.find(
+            {"patient_id": patient_id},
+            {"_id": 0, "patient_id": 0}
+        ).sort([("created_at", DESCENDING), ("_id", DESCENDING)]).skip(skip).limit(limit))
+
+        total = patient.get("doctor_notes_count")
+        if total is None:
+            total = patient_notes_collection.count_documents({"patient_id": patient_id})
+
+        log_audit_action("get_patient_notes", patient_id, user_id, {
+            "name": patient["name"],
+            "page": page,
+            "limit": limit
+        })
+
+        return jsonify({
+            "notes": notes,
+            "total": total,
+            "pages": (total + limit - 1) // limit,
+            "current_page": page
+        }), 200
+
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    except ValidationErrorCustom as e:
+        return jsonify({"message": str(e)}), e.status_code
+    except Exception as e:
+        logger.error({"message": f"Error fetching notes for patient {patient_id}: {str(e)}"})
+        return jsonify({"message": "Internal server error"}), 500
+
+@app.route('/patients/<int:patient_id>/notes', methods=['POST'])
+def add_patient_note(patient_id):
+    try:
+        note = parse_request_body(NoteCreate)
+        patient = patients_collection.find_one(
+            {"patient_id": patient_id},
+            {"_id": 0, "name": 1, "department": 1}
+        )
+        if not patient:
+            raise ValidationErrorCustom("Patient not found", 404)
+
+        now = datetime.now(UTC).isoformat()
+        update_ops = note_update_ops([note.note])
+        update_ops["$set"] = {"updated_at": now}
+        result = patients_collection.update_one({"patient_id": patient_id}, update_ops)
+        if result.matched_count == 0:
+            raise DatabaseError("Failed to add note")
+        insert_patient_notes(patient_id, [note.note], note.user_id, now)
+
+        log_audit_action("add_patient_note", patient_id, note.user_id, {
+            "name": patient["name"],
+            "department": patient.get("department")
+        })
+
+        return jsonify({"message": "Note added successfully", "created_at": now}), 201
+
+    except ValidationError as e:
+        return jsonify({"message": e.errors()}), 400
+    except ValidationErrorCustom as e:
+        return jsonify({"message": str(e)}), e.status_code
+    except DatabaseError as e:
+        return jsonify({"message": str(e)}), e.status_code
+    except Exception as e:
+        logger.error({"message": f"Error adding note for patient {patient_id}: {str(e)}"})
+        return jsonify({"message": "Internal server error"}), 500
+
 @app.route('/patients/<int:patient_id>', methods=['DELETE'])
 def delete_patient(patient_id):
     try:
@@ -570,6 +1240,7 @@ def delete_patient(patient_id):
         result = patients_collection.delete_one({"patient_id": patient_id})
         if result.deleted_count == 0:
             raise DatabaseError("Failed to delete patient")
+        patient_notes_collection.delete_many({"patient_id": patient_id})
 
         log_audit_action("delete_patient", patient_id, user_id, {
             "name": patient["name"],
@@ -589,11 +1260,7 @@ def delete_patient(patient_id):
 @app.route('/audit', methods=['POST'])
 def log_audit():
     try:
-        data = request.get_json()
-        if not data:
-            raise ValidationErrorCustom("No data provided")
-
-        audit_log = AuditLog(**data).model_dump()
+        audit_log = parse_request_body(AuditLog).model_dump()
         audit_logs_collection.insert_one(audit_log)
         return jsonify({"message": "Audit log recorded"}), 201
 
@@ -606,6 +1273,7 @@ def log_audit():
         return jsonify({"message": "Internal server error"}), 500
 
 @app.route('/insights', methods=['GET'])
+@rate_limited("insights", per_minute=30, burst=5, max_concurrent=2)
 def get_insights():
     try:
         user_id = request.args.get('user_id', 'anonymous')
@@ -748,6 +1416,7 @@ def after_request(response):
     return response    
 
 @app.route('/patients/<int:patient_id>/suggest_medicines', methods=['GET'])
+@rate_limited("suggest_medicines", per_minute=10, burst=3, max_concurrent=4)
 def suggest_medicines(patient_id):
     try:
         user_id = request.args.get('user_id', 'anonymous')
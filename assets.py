@@ -0,0 +1,174 @@
+"""Build fingerprinted, precompressed static assets into static/dist.
+
+Usage: python assets.py
+
+Writes content-hashed copies of the JS/CSS/image files, gzip and brotli
+variants for text assets, responsive WebP/AVIF versions of the background
+image, and a manifest.json mapping source paths to built paths. app.py serves
+the built files with immutable caching whenever the manifest exists.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+from io import BytesIO
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip variants are always written
+    brotli = None
+
+try:
+    from PIL import Image, features
+except ImportError:  # Pillow is optional; images are then only fingerprinted
+    Image = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_NAME = "manifest.json"
+
+COMPRESSIBLE = (".css", ".js", ".svg", ".ico", ".json")
+BACKGROUND = "css/background.jpg"
+BACKGROUND_WIDTHS = [640, 1280, 1920]
+
+IMPORT_RE = re.compile(r"""@import\s+url\(\s*['"]?([^'")]+)['"]?\s*\)\s*;""")
+URL_RE = re.compile(r"""url\(\s*['"]?([^'")]+)['"]?\s*\)""")
+
+
+def fingerprint(path: str, content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()[:10]
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest}{ext}"
+
+
+def write_asset(manifest: dict, source: str, content: bytes) -> str:
+    built = fingerprint(source, content)
+    target = os.path.join(DIST_DIR, built)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "wb") as f:
+        f.write(content)
+    if built.endswith(COMPRESSIBLE):
+        with open(target + ".gz", "wb") as f:
+            # mtime=0 keeps the output byte-identical across builds
+            with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=9, mtime=0) as gz:
+                gz.write(content)
+        if brotli is not None:
+            with open(target + ".br", "wb") as f:
+                f.write(brotli.compress(content, quality=11))
+    manifest[source] = built
+    return built
+
+
+def build_background(manifest: dict) -> dict:
+    """Write resized JPEG/WebP/AVIF variants; return {width: {format: built_path}}."""
+    with open(os.path.join(STATIC_DIR, BACKGROUND), "rb") as f:
+        original = f.read()
+    if Image is None:
+        return {None: {"jpeg": write_asset(manifest, BACKGROUND, original)}}
+
+    formats = ["jpeg", "webp"] + (["avif"] if features.check("avif") else [])
+    variants = {}
+    with Image.open(BytesIO(original)) as img:
+        img = img.convert("RGB")
+        for width in BACKGROUND_WIDTHS:
+            if width > img.width:
+                continue
+            resized = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+            variants[width] = {}
+            for fmt in formats:
+                buf = BytesIO()
+                resized.save(buf, fmt.upper(), quality=60 if fmt == "avif" else 75, optimize=fmt == "jpeg")
+                ext = "jpg" if fmt == "jpeg" else fmt
+                source = f"css/background-{width}.{ext}"
+                variants[width][fmt] = write_asset(manifest, source, buf.getvalue())
+    if not variants:
+        return {None: {"jpeg": write_asset(manifest, BACKGROUND, original)}}
+    # The largest JPEG doubles as the fallback for the original reference
+    manifest[BACKGROUND] = variants[max(variants)]["jpeg"]
+    return variants
+
+
+def relative_url(from_path: str, to_path: str) -> str:
+    """URL of one asset relative to another; fingerprinting keeps files in their source directory,
+    so the result works wherever the build is mounted."""
+    return os.path.relpath(to_path, os.path.dirname(from_path) or ".").replace(os.sep, "/")
+
+
+def background_css(css_path: str, variants: dict) -> str:
+    mime = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg"}
+
+    def image_set(paths: dict) -> str:
+        candidates = [f'url("{relative_url(css_path, paths[fmt])}") type("{mime[fmt]}")'
+                      for fmt in ("avif", "webp", "jpeg") if fmt in paths]
+        return f"body {{ background-image: image-set({', '.join(candidates)}); }}"
+
+    widths = sorted(w for w in variants if w is not None)
+    if not widths:
+        return ""
+    rules = [image_set(variants[widths[-1]])]
+    for width in reversed(widths[:-1]):
+        rules.append(f"@media (max-width: {width}px) {{ {image_set(variants[width])} }}")
+    return "\n/* Responsive background variants */\n" + "\n".join(rules) + "\n"
+
+
+def bundle_css(path: str, seen=None) -> str:
+    """Inline @import rules so the page needs one stylesheet request."""
+    seen = seen if seen is not None else set()
+    seen.add(path)
+    with open(os.path.join(STATIC_DIR, path), encoding="utf-8") as f:
+        css = f.read()
+
+    def inline(match):
+        imported = os.path.normpath(os.path.join(os.path.dirname(path), match.group(1))).replace(os.sep, "/")
+        return "" if imported in seen else bundle_css(imported, seen)
+
+    return IMPORT_RE.sub(inline, css)
+
+
+def build_css(manifest: dict, path: str, background_variants: dict):
+    css = bundle_css(path)
+
+    def rewrite(match):
+        ref = match.group(1)
+        if ref.startswith(("data:", "http:", "https:", "/")):
+            return match.group(0)
+        source = os.path.normpath(os.path.join(os.path.dirname(path), ref)).replace(os.sep, "/")
+        if source not in manifest:
+            return match.group(0)
+        return f'url("{relative_url(path, manifest[source])}")'
+
+    css = URL_RE.sub(rewrite, css)
+    if path == "css/styles.css":
+        css += background_css(path, background_variants)
+    write_asset(manifest, path, css.encode("utf-8"))
+
+
+def build_assets():
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+    os.makedirs(DIST_DIR)
+    manifest = {}
+
+    background_variants = build_background(manifest)
+
+    for dirpath, dirnames, filenames in os.walk(STATIC_DIR):
+        dirnames[:] = [d for d in dirnames if os.path.join(dirpath, d) != DIST_DIR]
+        for name in sorted(filenames):
+            source = os.path.relpath(os.path.join(dirpath, name), STATIC_DIR).replace(os.sep, "/")
+            if source == BACKGROUND or source.endswith(".css"):
+                continue
+            with open(os.path.join(dirpath, name), "rb") as f:
+                write_asset(manifest, source, f.read())
+
+    build_css(manifest, "css/styles.css", background_variants)
+
+    with open(os.path.join(DIST_DIR, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+if __name__ == "__main__":
+    built = build_assets()
+    print(f"Built {len(built)} assets into {DIST_DIR}")
@@ -0,0 +1,74 @@
+"""Micro-benchmark: stdlib json vs orjson on realistic API payloads.
+
+Run with ``python benchmarks/json_serialization.py``. The payloads mirror a
+full 100-row ``GET /patients`` page and a ``GET /insights`` response.
+"""
+import json
+import timeit
+from datetime import datetime, timedelta, UTC
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def make_patient_page(rows=100, notes_per_patient=20):
+    now = datetime.now(UTC)
+    patients = []
+    for i in range(rows):
+        created = now - timedelta(days=i)
+        patients.append({
+            "patient_id": i + 1,
+            "name": f"Patient {i + 1}",
+            "age": 20 + i % 70,
+            "gender": ["Male", "Female", "Other"][i % 3],
+            "contact_info": {
+                "phone": f"555{i:07d}",
+                "email": f"patient{i}@example.com",
+                "address": f"{i} Main Street, Springfield",
+            },
+            "allergies": ["Penicillin", "Peanuts"][: i % 3],
+            "blood_group": ["A+", "B+", "O+", "AB-"][i % 4],
+            "emergency_contact_number": f"666{i:07d}",
+            "prescriptions": [f"Medicine {j}" for j in range(i % 5)],
+            "doctor_notes": [f"Follow-up note {j} for patient {i}: vitals stable." for j in range(notes_per_patient)],
+            "department": ["Cardiology", "Neurology", "Oncology"][i % 3],
+            "user_id": "anonymous",
+            "created_at": created,
+            "updated_at": created,
+        })
+    return {"patients": patients, "total": 5000, "pages": 50, "current_page": 1}
+
+
+def make_insights():
+    return {
+        "gender_distribution": {"Male": 2400, "Female": 2500, "Other": 80, "Unknown": 20},
+        "top_allergies": [{"name": f"Allergy {i}", "count": 500 - i} for i in range(5)],
+        "age_distribution": [{"range": r, "count": 1000} for r in ("0-30", "31-60", "61-90", "91-150")],
+        "blood_group_distribution": [{"name": bg, "count": 600} for bg in ("A+", "A-", "B+", "B-", "O+", "O-", "AB+", "AB-")],
+        "visit_frequency_per_month": [{"month": f"20{y:02d}-{m:02d}", "count": 100} for y in range(20, 26) for m in range(1, 13)],
+        "avg_age_per_department": [{"department": f"Dept {i}", "average_age": 45.5} for i in range(20)],
+    }
+
+
+def bench(label, payload, number=200):
+    stdlib = timeit.timeit(lambda: json.dumps(payload, default=_default).encode("utf-8"), number=number)
+    print(f"{label:<28} stdlib json: {stdlib / number * 1e6:9.1f} us/op", end="")
+    if orjson is None:
+        print("   (orjson not installed)")
+        return
+    fast = timeit.timeit(lambda: orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS), number=number)
+    print(f"   orjson: {fast / number * 1e6:9.1f} us/op   speedup: {stdlib / fast:5.1f}x")
+
+
+if __name__ == "__main__":
+    bench("patients page (100 rows)", make_patient_page())
+    bench("patients page (10 rows)", make_patient_page(rows=10))
+    bench("insights", make_insights())
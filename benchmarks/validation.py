@@ -0,0 +1,62 @@
+"""Micro-benchmark: per-request validation cost of the write path.
+
+Run with ``python benchmarks/validation.py``. Compares the old path
+(``json.loads`` + ``Model(**data)``, audit rows through ``AuditLog``) with
+``PatientCreate.model_validate_json`` on the raw body bytes and plain audit
+dicts. The models are imported from models.py, the same ones app.py uses.
+"""
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, UTC
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import AuditLog, PatientCreate  # noqa: E402
+
+
+RAW_BODY = json.dumps({
+    "name": "John Doe",
+    "age": 30,
+    "gender": "Male",
+    "contact_info": {"phone": "1234567890", "email": "john@example.com", "address": "123 Main St"},
+    "emergency_contact_number": "0987654321",
+    "allergies": ["Penicillin"],
+    "blood_group": "O+",
+    "department": "Cardiology",
+    "prescriptions": ["Aspirin", "Metformin"],
+    "doctor_notes": ["Stable, follow up in two weeks."] * 5,
+    "user_id": "anonymous"
+}).encode("utf-8")
+
+AUDIT_ARGS = ("add_patient", 42, "anonymous", {"name": "John Doe", "patient_id": 42, "department": "Cardiology"})
+
+
+def old_request():
+    PatientCreate(**json.loads(RAW_BODY)).model_dump(exclude_none=True)
+
+
+def new_request():
+    PatientCreate.model_validate_json(RAW_BODY).model_dump(exclude_none=True)
+
+
+def old_audit():
+    action, patient_id, user_id, details = AUDIT_ARGS
+    AuditLog(action=action, patient_id=patient_id, user_id=user_id, details=details).model_dump()
+
+
+def new_audit():
+    action, patient_id, user_id, details = AUDIT_ARGS
+    {"action": action, "patient_id": patient_id, "user_id": user_id, "timestamp": datetime.now(UTC), "details": details}
+
+
+def bench(label, old, new, number=20000):
+    old_t = timeit.timeit(old, number=number) / number * 1e6
+    new_t = timeit.timeit(new, number=number) / number * 1e6
+    print(f"{label:<22} before: {old_t:7.2f} us/op   after: {new_t:7.2f} us/op   speedup: {old_t / new_t:5.1f}x")
+
+
+if __name__ == "__main__":
+    bench("patient body", old_request, new_request)
+    bench("audit row", old_audit, new_audit)
@@ -0,0 +1,52 @@
+"""Pydantic request models, kept free of database and Flask imports so tools can import them."""
+from datetime import datetime, UTC
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, EmailStr, Field
+
+class ContactInfo(BaseModel):
+    phone: str = Field(..., min_length=10, max_length=15)
+    email: EmailStr
+    address: str = Field(..., min_length=1)
+
+class PatientCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    age: int = Field(..., ge=0, le=150)
+    gender: Optional[str] = Field(default=None, max_length=20)
+    contact_info: ContactInfo
+    allergies: List[str] = []
+    blood_group: Optional[str] = Field(default=None, max_length=10)
+    emergency_contact_number: str = Field(..., min_length=10, max_length=15)
+    prescriptions: List[str] = []
+    doctor_notes: List[str] = []
+    department: Optional[str] = Field(default=None, min_length=1, max_length=100)
+    user_id: str = "anonymous"
+
+class PatientUpdate(BaseModel):
+    name: Optional[str] = Field(default=None, min_length=1, max_length=100)
+    age: Optional[int] = Field(default=None, ge=0, le=150)
+    gender: Optional[str] = Field(default=None, max_length=20)
+    contact_info: Optional[ContactInfo] = None
+    allergies: Optional[List[str]] = None
+    blood_group: Optional[str] = Field(default=None, max_length=10)
+    emergency_contact_number: Optional[str] = Field(default=None, min_length=10, max_length=15)
+    prescriptions: Optional[List[str]] = None
+    doctor_notes: Optional[List[str]] = None
+    department: Optional[str] = Field(default=None, min_length=1, max_length=100)
+    user_id: str = "anonymous"
+
+class NoteCreate(BaseModel):
+    note: str = Field(..., min_length=1, max_length=500)
+    user_id: str = "anonymous"
+
+class PatientBatchGet(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=100)
+    fields: Optional[List[str]] = None
+
+class AuditLog(BaseModel):
+    action: str
+    patient_id: Optional[int] = None
+    user_id: str
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    details: Dict[str, Any] = {}
+
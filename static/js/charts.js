@@ -134,19 +134,13 @@ async function createCharts() {
         }
 
         const response = await fetchData('/insights');
+        const series = insightsSeries(response);
 
-        chartConfigs[0].labels = Object.keys(response.gender_distribution || {});
-        chartConfigs[0].getData = () => Object.values(response.gender_distribution || {});
-        chartConfigs[1].labels = (response.top_allergies || []).map(item => item.name);
-        chartConfigs[1].getData = () => (response.top_allergies || []).map(item => item.count);
-        chartConfigs[2].labels = (response.age_distribution || []).map(item => item.range);
-        chartConfigs[2].getData = () => (response.age_distribution || []).map(item => item.count);
-        chartConfigs[3].labels = (response.blood_group_distribution || []).map(item => item.name);
-        chartConfigs[3].getData = () => (response.blood_group_distribution || []).map(item => item.count);
-        chartConfigs[4].labels = (response.visit_frequency_per_month || []).map(item => item.month);
-        chartConfigs[4].getData = () => (response.visit_frequency_per_month || []).map(item => item.count);
-        chartConfigs[5].labels = (response.avg_age_per_department || []).map(item => item.department);
-        chartConfigs[5].getData = () => (response.avg_age_per_department || []).map(item => item.average_age);
+        chartConfigs.forEach(config => {
+            const [labels, data] = series[config.id];
+            config.labels = labels;
+            config.getData = () => data;
+        });
 
         chartConfigs.forEach((config) => {
             const canvas = document.getElementById(config.id);
@@ -242,6 +236,52 @@ async function createCharts() {
     }
 }
 
+// Map an /insights response to [labels, data] per chart id
+function insightsSeries(response) {
+    return {
+        'gender-chart': [
+            Object.keys(response.gender_distribution || {}),
+            Object.values(response.gender_distribution || {})
+        ],
+        'allergies-chart': [
+            (response.top_allergies || []).map(item => item.name),
+            (response.top_allergies || []).map(item => item.count)
+        ],
+        'age-dist-chart': [
+            (response.age_distribution || []).map(item => item.range),
+            (response.age_distribution || []).map(item => item.count)
+        ],
+        'blood-group-chart': [
+            (response.blood_group_distribution || []).map(item => item.name),
+            (response.blood_group_distribution || []).map(item => item.count)
+        ],
+        'visits-chart': [
+            (response.visit_frequency_per_month || []).map(item => item.month),
+            (response.visit_frequency_per_month || []).map(item => item.count)
+        ],
+        'age-dept-chart': [
+            (response.avg_age_per_department || []).map(item => item.department),
+            (response.avg_age_per_department || []).map(item => item.average_age)
+        ]
+    };
+}
+
+// Refresh existing charts without re-creating them; used for live updates
+async function updateChartsInPlace() {
+    try {
+        const series = insightsSeries(await fetchData('/insights'));
+        Object.entries(series).forEach(([id, [labels, data]]) => {
+            const chart = chartInstances[id];
+            if (!chart) return;
+            chart.data.labels = labels;
+            chart.data.datasets[0].data = data;
+            chart.update('none');
+        });
+    } catch (error) {
+        console.error('Error refreshing charts:', error.message);
+    }
+}
+
 function showNoDataMessage(chartId) {
     const container = document.getElementById(chartId)?.parentElement;
     if (container) {
@@ -139,8 +139,12 @@ const fetchData = async (url, options = {}) => {
             if (response.status === 400) message = 'Invalid input data.';
             if (response.status === 404) message = 'Resource not found.';
             if (response.status === 409) message = 'Duplicate data detected.';
+            if (response.status === 429) message = `Too many requests. Please retry in ${response.headers.get('Retry-After') || 'a few'} seconds.`;
+            if (response.status === 503) message = 'Server busy. Please retry shortly.';
             if (response.status === 500) message = 'Server error. Please try again later.';
-            throw Object.assign(new Error(message), { status: response.status });
+            // Keep the server's explanation for callers that can show something more specific
+            const serverMessage = typeof result.message === 'string' ? result.message : null;
+            throw Object.assign(new Error(message), { status: response.status, serverMessage });
         }
         return result;
     } catch (error) {
@@ -164,6 +168,45 @@ const fetchData = async (url, options = {}) => {
     }
 };
 
+// Subscribe to live patient changes pushed by /patients/stream.
+// onChange receives {op: 'insert'|'update'|'delete', patient_id, patient} or {op: 'resync'}.
+// The browser retries dropped streams itself; a refused stream (e.g. 503 when the
+// server is at its stream cap) closes for good, so retry it later and resync.
+const subscribePatientUpdates = onChange => {
+    if (typeof EventSource === 'undefined') return;
+    const userId = document.querySelector('#user_id')?.value || 'anonymous';
+    let source;
+    const connect = () => {
+        source = new EventSource(`${API_BASE}/patients/stream?user_id=${userId}`);
+        source.addEventListener('patient', e => {
+            try {
+                onChange(JSON.parse(e.data));
+            } catch (error) {
+                console.error('Invalid patient update:', error.message);
+            }
+        });
+        source.addEventListener('resync', () => onChange({ op: 'resync' }));
+        source.onerror = () => {
+            if (source.readyState === EventSource.CLOSED) {
+                setTimeout(() => {
+                    connect();
+                    onChange({ op: 'resync' });
+                }, 30000);
+            }
+        };
+    };
+    connect();
+    window.addEventListener('beforeunload', () => source.close());
+};
+
+const debounce = (fn, wait) => {
+    let timer;
+    return (...args) => {
+        clearTimeout(timer);
+        timer = setTimeout(() => fn(...args), wait);
+    };
+};
+
 const formatPatientDetails = patient => {
     const formatDate = dateStr => dateStr ? new Date(dateStr).toLocaleDateString('en-US', {
         year: 'numeric', month: 'long', day: 'numeric'
@@ -198,6 +241,9 @@ const formatPatientDetails = patient => {
         ` : '<p>No prescriptions recorded.</p>'}
 
         <hr class="section-separator"> <h3>Doctor Notes</h3>
+        ${patient.doctor_notes_count > (patient.doctor_notes?.length || 0) ? `
+            <p><small>Showing the latest ${patient.doctor_notes.length} of ${patient.doctor_notes_count} notes.</small></p>
+        ` : ''}
         ${patient.doctor_notes?.length ? `
             <ul>
                 ${patient.doctor_notes.map(note => `<li>${note}</li>`).join('')}
@@ -103,21 +103,33 @@ document.addEventListener('DOMContentLoaded', () => {
                 `;
             }
 
-            // Update Quick Stat
-            const totalPatients = data.total || 0;
-            const newPatients = data.patients.filter(p => {
-                const created = new Date(p.created_at);
-                const now = new Date();
-                return created.getMonth() === now.getMonth() && created.getFullYear() === now.getFullYear();
-            }).length;
-            document.getElementById('total-patients').textContent = totalPatients;
-            document.getElementById('new-patients').textContent = newPatients;
+            updateQuickStats(data);
         } catch (error) {
             showAlert('home-error', 'alert-danger', `Error loading patient overview: ${error.message}`);
             logAudit('error_fetch_carousel', null, { error: error.message });
         }
     }
 
+    function updateQuickStats(data) {
+        const totalPatients = data.total || 0;
+        const newPatients = (data.patients || []).filter(p => {
+            const created = new Date(p.created_at);
+            const now = new Date();
+            return created.getMonth() === now.getMonth() && created.getFullYear() === now.getFullYear();
+        }).length;
+        document.getElementById('total-patients').textContent = totalPatients;
+        document.getElementById('new-patients').textContent = newPatients;
+    }
+
+    // Recompute the quick stats without rebuilding the carousel
+    async function fetchOverviewStats() {
+        try {
+            updateQuickStats(await fetchData(`/patients?page=1&fields=created_at`));
+        } catch (error) {
+            console.error('Error refreshing patient stats:', error.message);
+        }
+    }
+
     function showCarouselItem(index) {
         carouselItems.forEach((item, i) => {
             if (i === index) {
@@ -137,7 +149,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     async function fetchDoctorNotes() {
         try {
-            const data = await fetchData(`/patients?page=1`);
+            const data = await fetchData(`/patients?page=1&fields=name,doctor_notes,updated_at`);
             const allNotes = [];
             data.patients.forEach(patient => {
                 if (Array.isArray(patient.doctor_notes) && patient.doctor_notes.length) {
@@ -378,4 +390,26 @@ document.addEventListener('DOMContentLoaded', () => {
 
     fetchPatientsForOverview();
     fetchDoctorNotes();
+
+    // Live updates: adjust the total in place and refresh notes only when they change
+    const refreshNotes = debounce(fetchDoctorNotes, 2000);
+    const refreshStats = debounce(fetchOverviewStats, 2000);
+    subscribePatientUpdates(change => {
+        const totalEl = document.getElementById('total-patients');
+        const total = parseInt(totalEl?.textContent, 10) || 0;
+        if (change.op === 'insert' && totalEl) {
+            totalEl.textContent = total + 1;
+            const newEl = document.getElementById('new-patients');
+            if (newEl) newEl.textContent = (parseInt(newEl.textContent, 10) || 0) + 1;
+        } else if (change.op === 'delete' && totalEl) {
+            totalEl.textContent = Math.max(0, total - 1);
+        }
+        if (change.op === 'resync') {
+            // Missed events (including deletes seen only as a count change) invalidate the counters
+            refreshStats();
+        }
+        if (change.op === 'resync' || change.op === 'delete' || 'doctor_notes' in (change.patient || {})) {
+            refreshNotes();
+        }
+    });
 });
\ No newline at end of file
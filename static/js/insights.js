@@ -2,6 +2,7 @@ document.addEventListener('DOMContentLoaded', () => {
     async function initializeInsights() {
         try {
             await createCharts();
+            subscribePatientUpdates(debounce(updateChartsInPlace, 5000));
             logAudit('view_insights', null, {});
         } catch (error) {
             console.error('Error initializing insights:', error.message);
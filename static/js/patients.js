@@ -15,20 +15,9 @@ document.addEventListener('DOMContentLoaded', () => {
             totalPages = response.pages || 1;
 
             const tbody = document.getElementById('patients-table-body');
+            visiblePatients = new Map((response.patients || []).map(p => [p.patient_id, p]));
             tbody.innerHTML = response.patients?.length > 0
-                ? response.patients.map(patient => `
-                    <tr>
-                        <td>${patient.patient_id || 'N/A'}</td>
-                        <td>${patient.name || 'N/A'}</td>
-                        <td>${patient.age ?? 'N/A'}</td>
-                        <td>${patient.gender || 'N/A'}</td>
-                        <td>${patient.department || 'N/A'}</td>
-                        <td>${patient.contact_info?.phone || 'N/A'}</td>
-                        <td>
-                            <button class="btn btn-primary" onclick="viewPatient(${patient.patient_id})">View</button>
-                        </td>
-                    </tr>
-                `).join('')
+                ? response.patients.map(renderPatientRow).join('')
                 : '<tr><td colspan="7">No patients found.</td></tr>';
 
             renderPagination();
@@ -49,6 +38,42 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    let visiblePatients = new Map();
+
+    function renderPatientRow(patient) {
+        return `
+                    <tr data-patient-id="${patient.patient_id}">
+                        <td>${patient.patient_id || 'N/A'}</td>
+                        <td>${patient.name || 'N/A'}</td>
+                        <td>${patient.age ?? 'N/A'}</td>
+                        <td>${patient.gender || 'N/A'}</td>
+                        <td>${patient.department || 'N/A'}</td>
+                        <td>${patient.contact_info?.phone || 'N/A'}</td>
+                        <td>
+                            <button class="btn btn-primary" onclick="viewPatient(${patient.patient_id})">View</button>
+                        </td>
+                    </tr>
+                `;
+    }
+
+    // Patch visible rows from live updates; anything that may move rows between pages refetches
+    const refetchPatients = debounce(() => fetchPatients(), 1000);
+    function applyPatientChange(change) {
+        const row = document.querySelector(`#patients-table-body tr[data-patient-id="${change.patient_id}"]`);
+        if (change.op === 'update' && row) {
+            const patient = { ...visiblePatients.get(change.patient_id), ...change.patient };
+            visiblePatients.set(change.patient_id, patient);
+            row.outerHTML = renderPatientRow(patient);
+            if ('name' in change.patient || 'department' in change.patient) refetchPatients();
+        } else if (change.op === 'delete' && row) {
+            row.remove();
+            visiblePatients.delete(change.patient_id);
+            refetchPatients();
+        } else if (change.op === 'insert' || change.op === 'resync') {
+            refetchPatients();
+        }
+    }
+
     function renderPagination() {
         const paginationContainer = document.getElementById('pagination');
         if (!paginationContainer) return;
@@ -141,6 +166,7 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     fetchPatients();
+    subscribePatientUpdates(applyPatientChange);
 
     const patientModal = document.getElementById('patientModal');
     if (patientModal) {
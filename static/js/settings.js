@@ -61,6 +61,8 @@ document.addEventListener('DOMContentLoaded', () => {
             document.getElementById('edit_allergies').value = patient.allergies?.join('\n') || '';
             document.getElementById('edit_prescriptions').value = patient.prescriptions?.join('\n') || '';
             document.getElementById('edit_doctor_notes').value = patient.doctor_notes?.join('\n') || '';
+            // Notes are append-only; remember what was shown so only added lines are sent
+            editPatientForm.dataset.originalNotes = document.getElementById('edit_doctor_notes').value;
             console.log('Showing modal...');
             editPatientModal.classList.remove('hidden');
             logAudit('open_edit_patient', patientId, { name: patient.name });
@@ -106,11 +108,14 @@ document.addEventListener('DOMContentLoaded', () => {
                 allergies: normalizeInput(formData.get('allergies')).split('\n').filter(a => a.trim()),
                 emergency_contact_number: normalizeInput(formData.get('emergency_contact')),
                 prescriptions: normalizeInput(formData.get('prescriptions')).split('\n').filter(p => p.trim()),
-                doctor_notes: normalizeInput(formData.get('doctor_notes')).split('\n').filter(n => n.trim()),
                 blood_group: normalizeInput(formData.get('blood_group')) || null,
                 user_id: document.getElementById('user_id')?.value || 'anonymous'
             };
 
+            const notes = splitNotes(formData.get('doctor_notes'));
+            const originalNotes = splitNotes(editPatientForm.dataset.originalNotes);
+            const newNotes = notes.slice(originalNotes.length);
+
             // Client-side validations
             if (!patientData.name) return showError('edit_name_error', 'Name is required');
             if (patientData.name.length > 100) return showError('edit_name_error', 'Name must be 1-100 characters');
@@ -126,8 +131,9 @@ document.addEventListener('DOMContentLoaded', () => {
             if (patientData.allergies.some(a => a.length < 1 || a.length > 100)) return showError('edit_allergies_error', 'Each allergy must be 1-100 characters');
             if (patientData.prescriptions.length > 20) return showError('edit_prescriptions_error', 'Maximum of 20 prescriptions allowed');
             if (patientData.prescriptions.some(p => p.length < 1 || p.length > 100)) return showError('edit_prescriptions_error', 'Each prescription must be 1-100 characters');
-            if (patientData.doctor_notes.length > 20) return showError('edit_doctor_notes_error', 'Maximum of 20 notes allowed');
-            if (patientData.doctor_notes.some(n => n.length < 1 || n.length > 500)) return showError('edit_doctor_notes_error', 'Each note must be 1-500 characters');
+            if (originalNotes.some((n, i) => notes[i] !== n)) return showError('edit_doctor_notes_error', 'Existing notes cannot be edited or removed; add new notes on new lines');
+            if (newNotes.length > 20) return showError('edit_doctor_notes_error', 'Maximum of 20 new notes allowed');
+            if (newNotes.some(n => n.length < 1 || n.length > 500)) return showError('edit_doctor_notes_error', 'Each note must be 1-500 characters');
 
             try {
                 // Updated to use API_BASE which is now '/api'
@@ -135,13 +141,22 @@ document.addEventListener('DOMContentLoaded', () => {
                     method: 'PUT',
                     body: JSON.stringify(patientData)
                 });
+                for (const note of newNotes) {
+                    await fetchData(`${API_BASE}/patients/${patientData.patient_id}/notes`, {
+                        method: 'POST',
+                        body: JSON.stringify({ note, user_id: patientData.user_id })
+                    });
+                    // A retry after a partial failure must not post this note again
+                    originalNotes.push(note);
+                    editPatientForm.dataset.originalNotes = originalNotes.join('\n');
+                }
                 showAlert('edit-form-alert', 'alert-success', 'Patient updated successfully');
                 editPatientModal.classList.add('hidden');
                 fetchPatients();
                 logAudit('update_patient', patientData.patient_id, { name: patientData.name });
             } catch (error) {
                 let errorMessage = error.message || 'Failed to update patient';
-                if (error.status === 400) errorMessage = 'Invalid input data. Please check all fields.';
+                if (error.status === 400) errorMessage = error.serverMessage || 'Invalid input data. Please check all fields.';
                 if (error.status === 409) errorMessage = 'Phone, email, or emergency contact number already exists.';
                 showAlert('edit-form-alert', 'alert-danger', errorMessage);
                 logAudit('error_update_patient', patientData.patient_id, { error: errorMessage });
@@ -161,6 +176,10 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
+    function splitNotes(text) {
+        return normalizeInput(text).split('\n').filter(n => n.trim());
+    }
+
     function clearErrors() {
         const errorIds = [
             'edit_name_error', 'edit_age_error', 'edit_gender_error', 'edit_department_error', 'edit_phone_error',